@@ -1,5 +1,4 @@
 import streamlit as st
-import time
 
 # Page Setup
 st.set_page_config(page_title="🔐 Password Strength Analyzer", layout="centered")
@@ -15,7 +14,6 @@ from main import (
     isCommonPassword,
     containsDictionaryWord,
     getEntropy,
-    getCharsetSize,
     classicalCrackTime,
     quantumCrackTime,
     modernCrackTime,
@@ -23,7 +21,8 @@ from main import (
 )
 
 
-@st.cache_data(show_spinner=False)
+# cache_resource hands back the same shared objects on every rerun, instead of copying them.
+@st.cache_resource(show_spinner=False)
 def loadLists():
     return loadCommonPasswords("most_used_passwords_ncsc.txt"), loadDictionaryWords("words_alpha.txt")
 
@@ -44,9 +43,9 @@ if st.button("🔍 Analyze Password") and password:
 
         normalized = normalizeLeetspeak(password)
 
-        if isCommonPassword(password, commonPasswords):
+        if isCommonPassword(normalized, commonPasswords):
             st.error("Very Common Password: found in wordlist; cracked instantly!")
-        elif containsDictionaryWord(password, dictionaryWords):
+        elif containsDictionaryWord(normalized, dictionaryWords):
             st.warning("Contains a dictionary word; guessable with wordlists.")
         else:
             st.success("No obvious dictionary or common password patterns detected.")
@@ -55,7 +54,7 @@ if st.button("🔍 Analyze Password") and password:
         entropy, charset = getEntropy(password)
         classical = classicalCrackTime(entropy)
         quantum = quantumCrackTime(entropy)
-        modern = modernCrackTime(password, commonPasswords, dictionaryWords)
+        modern = modernCrackTime(password, normalized, commonPasswords, dictionaryWords)
 
         
         col1, col2 = st.columns(2)
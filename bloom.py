@@ -0,0 +1,104 @@
+import hashlib
+import math
+import mmap
+import os
+import tempfile
+
+# A Bloom filter is a packed bit array that answers "have I seen this item?" with a few hash probes.
+# It can give false positives (roughly errorRate of the time), but never false negatives.
+# For a wordlist, that's a tiny fraction of the memory a set of Python strings takes.
+class BloomFilter:
+    def __init__(self, capacity, errorRate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(errorRate) / math.log(2) ** 2), 8) # m = -n*ln(p)/ln(2)^2
+        self.hashCount = max(round(self.size / capacity * math.log(2)), 1)       # k = (m/n)*ln(2)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    # One digest per item; the k probe positions are derived from it by double hashing.
+    def _positions(self, item):
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashCount)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+# A sorted, newline separated wordlist on disk. It's memory mapped, so only the pages we touch get read,
+# and lookups are a binary search over the raw bytes.
+class SortedWordFile:
+    def __init__(self, filepath):
+        with open(filepath, 'rb') as file:
+            try:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # Empty files can't be mapped.
+                self.data = b""
+
+    # The same search works on the sorted bytes held in memory, for when the file can't be written.
+    @classmethod
+    def fromWords(cls, words):
+        sortedFile = cls.__new__(cls)
+        sortedFile.data = sortedWordBytes(words)
+        return sortedFile
+
+    def __contains__(self, item):
+        low, high = 0, len(self.data)
+        while low < high:
+            middle = (low + high) // 2
+            start = self.data.rfind(b"\n", 0, middle) + 1
+            end = self.data.find(b"\n", start)
+            if end == -1:
+                end = len(self.data)
+
+            line = self.data[start:end]
+            if line == item:
+                return True
+            if line < item:
+                low = end + 1
+            else:
+                high = start
+        return False
+
+
+def sortedWordBytes(words):
+    return b"".join(word + b"\n" for word in sorted(words))
+
+# Files are written to a temporary file in the same folder and then renamed over the real one, so a crash
+# or a second process starting at the same time never leaves a half written file behind.
+# mkstemp makes owner only files, so they get the usual permissions back before the rename. Otherwise caches
+# built by one user (say, root in a Docker build) couldn't be read by the user serving the app.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def writeFileAtomically(filepath, data):
+    fd, tempPath = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filepath)))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.chmod(tempPath, 0o666 & ~_UMASK)
+        os.replace(tempPath, filepath)
+    except BaseException:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        raise
+
+def writeSortedWordFile(filepath, words):
+    writeFileAtomically(filepath, sortedWordBytes(words))
+
+
+# The Bloom filter rules out most passwords straight away, and anything it lets through is confirmed on disk,
+# so false positives never reach the user. Passwords are looked up as UTF-8 bytes, like the list is stored.
+class CommonPasswordFilter:
+    def __init__(self, bloom, sortedFile):
+        self.bloom = bloom
+        self.sortedFile = sortedFile
+
+    def __contains__(self, password):
+        return password in self.bloom and password in self.sortedFile
@@ -1,175 +1,318 @@
-import math
-import time
-import re
-
-# Here, we load a common password list  and a dictionary wordlist. 
-def loadCommonPasswords(filepath="most_used_passwords_ncsc.txt"):
-    with open(filepath, encoding='utf-8', errors='ignore') as file:
-        return set(line.strip().lower() for line in file)
-    
-def loadDictionaryWords(filepath="words_alpha.txt"):
-    with open(filepath, encoding='utf-8', errors='ignore') as file:
-        return set(line.strip().lower() for line in file if len(line.strip()) >= 4)
-    
-# This is a leetspeak normalizer. This factors in common ways of mangling a password.
-# For example:
-#'password123' -> 'p455w0rd123'
-
-def normalizeLeetspeak(password):
-    substitutions = {'0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '@': 'a', '$': 's'}
-
-    for leet,normal in substitutions.items():
-        password = password.replace(leet,normal)
-    
-    return password.lower()
-
-# Checks if the password contains any words which can be found in a system dictionary.
-def containsDictionaryWord(password, wordlist):
-    password = normalizeLeetspeak(password)
-    for word in wordlist:
-        if len(word) >= 4 and word in password:
-            return True
-    return False
-
-# Checks if the password is in a common password list.
-def isCommonPassword(password, commonPasswords):
-    normalized = normalizeLeetspeak(password)
-    return normalized in commonPasswords
-
-# How difficult it is to crack a certain password depends on it's Character Set Size.
-# What different kinds of characters are you using in your passwords? The more unique and diverse, the better. 
-# A mix of lowercase letters, uppercase letters, digits and special characters make a password more difficult to crack.
-# Password length also plays a major role. Length will be handled in the Entropy section of the code. 
-
-def getCharsetSize(password):
-    size = 0
-
-    if any(c.islower() for c in password): #If any lowercase characters are in the password
-        size += 26
-
-    if any(c.isupper() for c in password): #Uppercase letters
-        size += 26
-
-    if any(c.isdigit() for c in password): #Decimal Digits
-        size+= 10
-
-    if any(c in "!@#$%^&*()-_=+[]{}|;:'\",.<>?/`~" for c in password): #Special Characters
-        size += 32
-
-    return size
-
-# Entropy Calculation:
-# The 'Entropy' of a password is a measure of how unpredictable or random it is. 
-# Mathematically, entropy = length of password x log2(Size of Character Set). It is measured in bits. 
-
-def getEntropy(password):
-    charsetSize = getCharsetSize(password)
-    entropy = len(password) * math.log2(charsetSize)
-    return entropy, charsetSize
-
-# Classical Computer Crack Time: Brute Force Approximation
-
-def classicalCrackTime(entropy, guessesPerSecond = 1e9):
-    combinations = 2**entropy
-    crackTime = combinations/guessesPerSecond
-    return crackTime
-
-# Quantum Computer Crack Time: The Grover's Algorithm Approximation
-
-def quantumCrackTime(entropy, guessesPerSecond = 1e9):
-    combinations = 2**entropy
-    crackTime = math.sqrt(combinations)/guessesPerSecond
-    return crackTime
-
-
-# Modern Crack Time checks the password's integrity with a list of english dictionary words, and a common password list. 
-def modernCrackTime(password, commonPasswords, dictionaryWords):
-    normalized = normalizeLeetspeak(password)
-
-    # 1. Very common password inside the wordlist file. 
-    if normalized in commonPasswords:
-        return 0.5  # Instant crack
-    
-    # 2. Contains dictionary word (even with substitutions)
-    if containsDictionaryWord(password, dictionaryWords):
-        # Check what comes after the dictionary word
-        match = re.search(r"(123|[!@#$%^&*]+|[0-9]{1,4})$", password)
-        if match:
-            suffix = match.group(0)
-            # If suffix is short (<=4 characters), it's weak
-            if len(suffix) <= 4:
-                return 30
-            # If suffix is long (5 or more digits/symbols), it's significantly stronger
-            elif len(suffix) >= 8:
-                return 180  # treat as stronger
-            else:
-                return 90
-        return 90  
-
-    # 3. Detecting keyboard or common date-based patterns. Again, all estimates. 
-    if re.search(r"(qwerty|asdf|zxcv|pass|love|god|admin|user)", normalized):
-        return 45
-
-    if re.search(r"(19[0-9]{2}|20[0-4][0-9])", password):
-        return 45 
-
-    if re.fullmatch(r"[a-z]{4,}\d{2,4}", normalized):
-        return 60
-
-    
-    if re.fullmatch(r"[a-z]{4,}[A-Z]{1}[a-z]*\d{1,4}", password):
-        return 120  # harder, but still guessable
-
-    # Fallback
-    entropy, _ = getEntropy(password)
-    return classicalCrackTime(entropy, guessesPerSecond=1e10)  # Modern GPUs are fast!
-
-
-# A time formatter.
-def timeFormat(seconds):
-    if seconds < 4:
-        return f"{seconds:.4f} seconds"
-    units = ['seconds', 'minutes', 'hours', 'days', 'years', 'centuries']
-    factors = [60,60,24,365,100]
-    i = 0
-
-    while i < len(factors) and seconds >= factors[i]:
-        seconds /= factors[i]
-        i += 1
-
-    return f"{seconds:.2f} {units[i]}"
-    
-# The actual analyze function with markdown and stuff still attached. 
-
-def analyze(password, commonPasswords, dictionaryWords, st):
-    if isCommonPassword(password, commonPasswords):
-        st.error("Very Common Password: found in password wordlist")
-    elif containsDictionaryWord(password, dictionaryWords):
-        st.warning("Contains a dictionary word")
-    else:
-        st.success("No dictionary or common patterns found")
-
-    entropy, charset = getEntropy(password)
-    classical = classicalCrackTime(entropy)
-    quantum = quantumCrackTime(entropy)
-    modern = modernCrackTime(password, commonPasswords, dictionaryWords)
-
-    st.metric("Charset Size", f"{charset} characters")
-    st.metric("Entropy", f"{entropy:.2f} bits")
-
-    st.markdown("### 🖥️ Estimated Crack Times")
-    st.info(f"Classical: `{timeFormat(classical)}`")
-    st.info(f"Quantum: `{timeFormat(quantum)}`")
-    st.info(f"Modern: `{timeFormat(modern)}`")
-
-
-# MAIN: 
-
-if __name__ == "__main__":
-
-    commonPasswords = loadCommonPasswords("most_used_passwords_ncsc.txt")
-    dictionaryWords = loadDictionaryWords("words_alpha.txt")  # or use /usr/share/dict/words
-
-    password = input("Enter a password to analyze: ")
-    analyze(password, commonPasswords, dictionaryWords)
-
+import bisect
+import collections.abc
+import functools
+import math
+import os
+import pickle
+import re
+
+from bloom import BloomFilter, CommonPasswordFilter, SortedWordFile, writeFileAtomically, writeSortedWordFile
+
+# pyahocorasick and marisa-trie are optional. Without either, we fall back to a plain set of words.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import marisa_trie
+except ImportError:
+    marisa_trie = None
+
+# Here, we load a common password list  and a dictionary wordlist. 
+# The files are read as raw bytes, so lowercasing and splitting happen over the whole file at once
+# instead of line by line in Python. With decode=True the lines come back as str, decoded in one go as well.
+def readWordlist(filepath, decode=False):
+    with open(filepath, 'rb') as file:
+        data = file.read()
+
+    if data.isascii() and not decode:
+        return data.lower().splitlines()
+
+    # bytes.lower() only knows ASCII, so let Python handle the rest
+    text = data.decode('utf-8', errors='ignore').lower()
+    return text.splitlines() if decode else text.encode('utf-8').splitlines()
+
+# Parsing a wordlist is the slow part of a cold start, so whatever we build from it is pickled next to it
+# and loaded straight back next time, until the wordlist file changes.
+# The cache names carry a version number. Bump it whenever BloomFilter, CommonPasswordFilter, the matchers
+# or readWordlist change, so caches in the old format are ignored instead of loaded.
+CACHE_VERSION = 1
+
+def isStale(cachePath, filepath):
+    return not os.path.exists(cachePath) or os.path.getmtime(cachePath) < os.path.getmtime(filepath)
+
+def loadCached(cachePath, filepath, build):
+    if not isStale(cachePath, filepath):
+        try:
+            with open(cachePath, 'rb') as file:
+                return pickle.load(file)
+        except Exception:
+            pass # A broken or incompatible cache just gets rebuilt.
+
+    result = build()
+    try:
+        writeFileAtomically(cachePath, pickle.dumps(result, protocol=5))
+    except OSError:
+        pass # Read only folder, we'll just parse again next time.
+    return result
+
+# The common password list is kept as a sorted copy on disk next to the original, plus a Bloom filter in memory.
+# The list is only parsed if one of them has to be rebuilt, and then just once for both.
+def loadCommonPasswords(filepath="most_used_passwords_ncsc.txt"):
+    readPasswords = functools.cache(lambda: set(readWordlist(filepath)))
+
+    sortedPath = f"{filepath}.v{CACHE_VERSION}.sorted"
+    sortedFile = None
+    if isStale(sortedPath, filepath):
+        try:
+            writeSortedWordFile(sortedPath, readPasswords())
+        except OSError:
+            sortedFile = SortedWordFile.fromWords(readPasswords()) # Read only folder, keep the sorted list in memory.
+    if sortedFile is None:
+        try:
+            sortedFile = SortedWordFile(sortedPath)
+        except OSError:
+            sortedFile = SortedWordFile.fromWords(readPasswords()) # Written by someone we can't read as.
+
+    bloom = loadCached(f"{filepath}.bloom.v{CACHE_VERSION}.pkl", filepath, lambda: buildBloomFilter(readPasswords()))
+    return CommonPasswordFilter(bloom, sortedFile)
+
+def buildBloomFilter(passwords):
+    passwords = set(passwords)
+    bloom = BloomFilter(len(passwords))
+    for password in passwords:
+        bloom.add(password)
+    return bloom
+    
+# The cache is named after the matcher type, so installing pyahocorasick or marisa-trie later takes effect.
+def loadDictionaryWords(filepath="words_alpha.txt"):
+    matcherType = "ahocorasick" if ahocorasick is not None else "marisa" if marisa_trie is not None else "set"
+    return loadCached(f"{filepath}.{matcherType}.v{CACHE_VERSION}.pkl", filepath, lambda: buildDictionaryMatcher(
+        set(word for word in readWordlist(filepath, decode=True) if len(word) >= 4)))
+
+# Instead of checking every dictionary word against the password one at a time, we compile all of them
+# into a single Aho-Corasick automaton, which finds any of them in one pass over the password.
+def buildDictionaryMatcher(words):
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return automaton
+
+    # A compressed trie shares the common prefixes of English words, so it's far smaller than a set of strings.
+    if marisa_trie is not None:
+        return marisa_trie.Trie(words)
+
+    return frozenset(words)
+    
+# This is a leetspeak normalizer. This factors in common ways of mangling a password.
+# For example:
+#'password123' -> 'p455w0rd123'
+
+# All substitutions happen in a single str.translate pass, using a table built once at import.
+_LEET_TABLE = str.maketrans({'0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '@': 'a', '$': 's'})
+
+def normalizeLeetspeak(password):
+    return password.translate(_LEET_TABLE).lower()
+
+# Checks if the password contains any words which can be found in a system dictionary.
+# It takes the already normalized password (see normalizeLeetspeak), so it's only normalized once per analysis.
+# Every dictionary word has at least 4 characters and some letters in it, so passwords without those can skip the lookup.
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+def containsDictionaryWord(normalized, dictionaryMatcher):
+    if len(normalized) < 4 or not _LETTER_RE.search(normalized):
+        return False
+
+    if isinstance(dictionaryMatcher, collections.abc.Set):
+        # A password only has a couple of thousand substrings of 4+ characters, far fewer than there are
+        # dictionary words, so we look each substring up in the set rather than scanning the whole set.
+        isWord = dictionaryMatcher.__contains__
+        length = len(normalized)
+        for i in range(length - 3):
+            for j in range(i + 4, length + 1):
+                if isWord(normalized[i:j]):
+                    return True
+        return False
+    if marisa_trie is not None and isinstance(dictionaryMatcher, marisa_trie.Trie):
+        # Any dictionary word starting at position i is a prefix of normalized[i:].
+        return any(dictionaryMatcher.prefixes(normalized[i:]) for i in range(len(normalized) - 3))
+    return next(dictionaryMatcher.iter(normalized), None) is not None
+
+# Checks if the password is in a common password list.
+# This also takes the normalized password. The list is stored as bytes, so it's encoded once here
+# and the same bytes go to both the Bloom filter and the on-disk check.
+def isCommonPassword(normalized, commonPasswords):
+    return normalized.encode('utf-8', errors='ignore') in commonPasswords
+
+# How difficult it is to crack a certain password depends on it's Character Set Size.
+# What different kinds of characters are you using in your passwords? The more unique and diverse, the better. 
+# A mix of lowercase letters, uppercase letters, digits and special characters make a password more difficult to crack.
+# Password length also plays a major role. Length will be handled in the Entropy section of the code. 
+
+# Each character class gets a bit: lowercase, uppercase, digits and special characters.
+# Rather than walking the password once per class, we OR every character's bits together in a single pass.
+_SPECIAL = frozenset("!@#$%^&*()-_=+[]{}|;:'\",.<>?/`~")
+_LOWER, _UPPER, _DIGIT, _SYMBOL = 1, 2, 4, 8
+
+def _classBits(c):
+    return ((_LOWER if c.islower() else 0) | (_UPPER if c.isupper() else 0)
+            | (_DIGIT if c.isdigit() else 0) | (_SYMBOL if c in _SPECIAL else 0))
+
+# Class bits for the first 256 code points are looked up; anything beyond that is worked out on the spot.
+_CLASS = bytes(_classBits(chr(code)) for code in range(256))
+
+# Charset size for each combination of bits: 26 lowercase, 26 uppercase, 10 digits, 32 special characters.
+_CHARSET_SIZES = [(26 if mask & _LOWER else 0) + (26 if mask & _UPPER else 0)
+                  + (10 if mask & _DIGIT else 0) + (32 if mask & _SYMBOL else 0) for mask in range(16)]
+
+def getCharsetSize(password):
+    mask = 0
+
+    # Nearly every typed password is plain ASCII. Then bytes.translate maps every character to its class bits
+    # in C, and only the handful of distinct values is left to OR together.
+    if password.isascii():
+        for bits in set(password.encode('ascii').translate(_CLASS)):
+            mask |= bits
+        return _CHARSET_SIZES[mask]
+
+    for c in password:
+        code = ord(c)
+        mask |= _CLASS[code] if code < 256 else _classBits(c)
+    return _CHARSET_SIZES[mask]
+
+# Entropy Calculation:
+# The 'Entropy' of a password is a measure of how unpredictable or random it is. 
+# Mathematically, entropy = length of password x log2(Size of Character Set). It is measured in bits. 
+
+def getEntropy(password):
+    charsetSize = getCharsetSize(password)
+    entropy = len(password) * math.log2(charsetSize)
+    return entropy, charsetSize
+
+# Classical Computer Crack Time: Brute Force Approximation
+# Both crack times are worked out in log space: 2**entropy on its own overflows a float for long passwords,
+# well before dividing by the guess rate would bring it back into range.
+# Past about 2**1024 seconds even the result doesn't fit in a float, so it comes back as a Python int instead,
+# which has no upper limit. The top 53 bits are kept, so it's as precise as the float would have been.
+
+def _exp2(exponent):
+    try:
+        return 2.0 ** exponent
+    except OverflowError:
+        whole = math.floor(exponent)
+        return round(2.0 ** (exponent - whole + 52)) << (whole - 52)
+
+def classicalCrackTime(entropy, guessesPerSecond = 1e9):
+    return _exp2(entropy - math.log2(guessesPerSecond))
+
+# Quantum Computer Crack Time: The Grover's Algorithm Approximation
+# Grover's algorithm needs about sqrt(combinations) guesses, which is half the entropy in log space.
+
+def quantumCrackTime(entropy, guessesPerSecond = 1e9):
+    return _exp2(entropy / 2 - math.log2(guessesPerSecond))
+
+
+# The pattern checks in modernCrackTime, set up once at import.
+# The keyboard/common words are plain substrings, and a loop of `in` checks beats the regex engine at those.
+_KEYBOARD_WORDS = ("qwerty", "asdf", "zxcv", "pass", "love", "god", "admin", "user")
+_SUFFIX_RE = re.compile(r"(123|[!@#$%^&*]+|[0-9]{1,4})$")
+_YEAR_RE = re.compile(r"(19[0-9]{2}|20[0-4][0-9])")
+_WORDNUM_RE = re.compile(r"[a-z]{4,}\d{2,4}")
+_WORDCAPNUM_RE = re.compile(r"[a-z]{4,}[A-Z]{1}[a-z]*\d{1,4}")
+
+# Modern Crack Time checks the password's integrity with a list of english dictionary words, and a common password list. 
+# It needs both the original and the normalized password.
+def modernCrackTime(password, normalized, commonPasswords, dictionaryWords):
+    # 1. Very common password inside the wordlist file. 
+    if isCommonPassword(normalized, commonPasswords):
+        return 0.5  # Instant crack
+    
+    # 2. Contains dictionary word (even with substitutions)
+    if containsDictionaryWord(normalized, dictionaryWords):
+        # Check what comes after the dictionary word
+        match = _SUFFIX_RE.search(password)
+        if match:
+            suffix = match.group(0)
+            # If suffix is short (<=4 characters), it's weak
+            if len(suffix) <= 4:
+                return 30
+            # If suffix is long (5 or more digits/symbols), it's significantly stronger
+            elif len(suffix) >= 8:
+                return 180  # treat as stronger
+            else:
+                return 90
+        return 90  
+
+    # 3. Detecting keyboard or common date-based patterns. Again, all estimates. 
+    for word in _KEYBOARD_WORDS:
+        if word in normalized:
+            return 45
+
+    if _YEAR_RE.search(password):
+        return 45 
+
+    if _WORDNUM_RE.fullmatch(normalized):
+        return 60
+
+    
+    if _WORDCAPNUM_RE.fullmatch(password):
+        return 120  # harder, but still guessable
+
+    # Fallback
+    entropy, _ = getEntropy(password)
+    return classicalCrackTime(entropy, guessesPerSecond=1e10)  # Modern GPUs are fast!
+
+
+# A time formatter.
+# Picks the largest unit that fits with a binary search over how many seconds each unit is, then divides once.
+_TIME_UNITS = ['seconds', 'minutes', 'hours', 'days', 'years', 'centuries']
+_TIME_UNIT_SECONDS = [1, 60, 60 * 60, 60 * 60 * 24, 60 * 60 * 24 * 365, 60 * 60 * 24 * 365 * 100]
+
+def timeFormat(seconds):
+    if seconds < 4:
+        return f"{seconds:.4f} seconds"
+    # Way past the age of the universe (~4e17 seconds), so only the order of magnitude matters.
+    # math.log10 also takes the huge ints from the crack time functions, so this never overflows.
+    if seconds > 1e18:
+        return f"~10^{int(math.log10(seconds) - math.log10(_TIME_UNIT_SECONDS[4]))} years"
+    i = bisect.bisect_right(_TIME_UNIT_SECONDS, seconds) - 1
+    return f"{seconds / _TIME_UNIT_SECONDS[i]:.2f} {_TIME_UNITS[i]}"
+    
+# The command line version of the analysis. The Streamlit UI lives in app.py, so this file never imports streamlit.
+
+def analyzeCli(password, commonPasswords, dictionaryWords):
+    normalized = normalizeLeetspeak(password)
+
+    if isCommonPassword(normalized, commonPasswords):
+        print("Very Common Password: found in password wordlist")
+    elif containsDictionaryWord(normalized, dictionaryWords):
+        print("Contains a dictionary word")
+    else:
+        print("No dictionary or common patterns found")
+
+    entropy, charset = getEntropy(password)
+    classical = classicalCrackTime(entropy)
+    quantum = quantumCrackTime(entropy)
+    modern = modernCrackTime(password, normalized, commonPasswords, dictionaryWords)
+
+    print(f"Charset Size: {charset} characters")
+    print(f"Entropy: {entropy:.2f} bits")
+
+    print("\nEstimated Crack Times")
+    print(f"Classical: {timeFormat(classical)}")
+    print(f"Quantum: {timeFormat(quantum)}")
+    print(f"Modern: {timeFormat(modern)}")
+
+
+# MAIN: 
+
+if __name__ == "__main__":
+
+    commonPasswords = loadCommonPasswords("most_used_passwords_ncsc.txt")
+    dictionaryWords = loadDictionaryWords("words_alpha.txt")  # or use /usr/share/dict/words
+
+    password = input("Enter a password to analyze: ")
+    analyzeCli(password, commonPasswords, dictionaryWords)
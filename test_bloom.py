@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from bloom import BloomFilter, CommonPasswordFilter, SortedWordFile, writeSortedWordFile
+
+WORDS = {b"123456", b"abc123", b"dragon", b"letmein", b"password", b"qwerty", b"zxcvbnm"}
+MISSING = [b"", b"0", b"aaa", b"dragons", b"passwor", b"password1", b"zzzzzzzz", b"\xff"]
+
+
+class SortedWordFileTest(unittest.TestCase):
+    def assertMatchesSet(self, sortedFile, words):
+        for word in words:
+            self.assertIn(word, sortedFile)
+        for word in MISSING:
+            self.assertEqual(word in sortedFile, word in words, word)
+
+    def testFileLookups(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "words.sorted")
+            writeSortedWordFile(path, WORDS)
+            sortedFile = SortedWordFile(path)
+
+            self.assertIn(min(WORDS), sortedFile)
+            self.assertIn(max(WORDS), sortedFile)
+            self.assertMatchesSet(sortedFile, WORDS)
+            self.assertEqual(os.listdir(folder), ["words.sorted"]) # No temporary files left behind.
+
+    def testInMemoryLookups(self):
+        self.assertMatchesSet(SortedWordFile.fromWords(WORDS), WORDS)
+
+    def testSingleAndEmptyLists(self):
+        self.assertMatchesSet(SortedWordFile.fromWords({b"dragon"}), {b"dragon"})
+        self.assertMatchesSet(SortedWordFile.fromWords(set()), set())
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "empty.sorted")
+            writeSortedWordFile(path, set())
+            self.assertNotIn(b"password", SortedWordFile(path))
+
+
+class BloomFilterTest(unittest.TestCase):
+    def testNoFalseNegatives(self):
+        items = [str(i).encode() for i in range(5000)]
+        bloom = BloomFilter(len(items))
+        for item in items:
+            bloom.add(item)
+        for item in items:
+            self.assertIn(item, bloom)
+
+    def testCommonPasswordFilterConfirmsOnDisk(self):
+        bloom = BloomFilter(len(WORDS) + 1)
+        for word in WORDS | {b"trustno1"}:
+            bloom.add(word)
+        commonPasswords = CommonPasswordFilter(bloom, SortedWordFile.fromWords(WORDS))
+
+        self.assertIn(b"trustno1", bloom)
+        self.assertNotIn(b"trustno1", commonPasswords)
+        self.assertIn(b"password", commonPasswords)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from bloom import SortedWordFile
+
+PASSWORDS = b"123456\nPassword\nqwerty\ndragon\n"
+
+
+class LoadCommonPasswordsTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.path = os.path.join(self.folder, "passwords.txt")
+        with open(self.path, 'wb') as file:
+            file.write(PASSWORDS)
+
+    def assertFindsPasswords(self, commonPasswords):
+        self.assertTrue(main.isCommonPassword("password", commonPasswords))
+        self.assertTrue(main.isCommonPassword("dragon", commonPasswords))
+        self.assertFalse(main.isCommonPassword("letmein", commonPasswords))
+
+    def testCachesAreReadableByOthers(self):
+        self.assertFindsPasswords(main.loadCommonPasswords(self.path))
+        umask = os.umask(0)
+        os.umask(umask)
+        for name in os.listdir(self.folder):
+            self.assertEqual(os.stat(os.path.join(self.folder, name)).st_mode & 0o777, 0o666 & ~umask, name)
+
+    def testParsesOnceOnColdStart(self):
+        with mock.patch("main.readWordlist", wraps=main.readWordlist) as readWordlist:
+            main.loadCommonPasswords(self.path)
+            main.loadCommonPasswords(self.path)
+        self.assertEqual(readWordlist.call_count, 1)
+
+    def testReadOnlyFolder(self):
+        with mock.patch("bloom.tempfile.mkstemp", side_effect=PermissionError):
+            self.assertFindsPasswords(main.loadCommonPasswords(self.path))
+        self.assertEqual(os.listdir(self.folder), ["passwords.txt"])
+
+    def testUnreadableSortedFile(self):
+        main.loadCommonPasswords(self.path)
+        with mock.patch.object(SortedWordFile, "__init__", side_effect=PermissionError):
+            self.assertFindsPasswords(main.loadCommonPasswords(self.path))
+
+
+class ContainsDictionaryWordTest(unittest.TestCase):
+    def testAnySetOfWords(self):
+        for words in ({"house", "dragon"}, frozenset({"house", "dragon"}), main.buildDictionaryMatcher({"house", "dragon"})):
+            self.assertTrue(main.containsDictionaryWord("myhouse42", words))
+            self.assertTrue(main.containsDictionaryWord("dragon", words))
+            self.assertFalse(main.containsDictionaryWord("hous3dragn", words))
+            self.assertFalse(main.containsDictionaryWord("1234", words))
+
+
+class LoadCachedTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.path = os.path.join(self.folder, "words.txt")
+        self.cachePath = self.path + ".pkl"
+        self.writeWordlist(b"apple\nbanana\n")
+
+    def writeWordlist(self, data):
+        with open(self.path, 'wb') as file:
+            file.write(data)
+
+    def load(self):
+        return main.loadCached(self.cachePath, self.path, lambda: main.readWordlist(self.path))
+
+    def testCacheIsReused(self):
+        self.assertEqual(self.load(), [b"apple", b"banana"])
+        with mock.patch("main.readWordlist") as readWordlist:
+            self.assertEqual(self.load(), [b"apple", b"banana"])
+        readWordlist.assert_not_called()
+
+    def testRebuildsWhenWordlistIsNewer(self):
+        self.load()
+        self.writeWordlist(b"cherry\n")
+        cacheTime = os.path.getmtime(self.cachePath)
+        os.utime(self.path, (cacheTime + 10, cacheTime + 10))
+        self.assertEqual(self.load(), [b"cherry"])
+
+    def testRebuildsCorruptCache(self):
+        self.load()
+        for data in (b"", b"not a pickle", b"\x80\x05\x95"):
+            with open(self.cachePath, 'wb') as file:
+                file.write(data)
+            self.assertEqual(self.load(), [b"apple", b"banana"])
+
+    def testWorksWhenCacheCantBeWritten(self):
+        with mock.patch("bloom.tempfile.mkstemp", side_effect=PermissionError):
+            self.assertEqual(self.load(), [b"apple", b"banana"])
+            self.assertEqual(self.load(), [b"apple", b"banana"])
+        self.assertFalse(os.path.exists(self.cachePath))
+
+
+if __name__ == "__main__":
+    unittest.main()